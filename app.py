@@ -1,17 +1,21 @@
+import hashlib
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
-from flask import Flask, redirect, render_template, request, send_file, send_from_directory, url_for, flash
+from flask import Flask, jsonify, redirect, render_template, request, send_file, send_from_directory, url_for, flash
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from markupsafe import Markup
 
+import assets
 from auth import User, UserStore
 from camera import capture_image
 from data_store import ReceiptStore
-from ocr import run_ocr
+from fragment_cache import FragmentCache
+from ocr import run_ocr, stats as ocr_stats
 
 BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("RECEIPT_SCANNER_DATA_DIR", BASE_DIR / "data"))
 IMAGES_DIR = DATA_DIR / "images"
 CSV_PATH = DATA_DIR / "receipts.csv"
 SQLITE_PATH = DATA_DIR / "receipts.db"
@@ -41,6 +45,12 @@ login_manager.login_view = "login"
 
 store = ReceiptStore(csv_path=str(CSV_PATH), sqlite_path=str(SQLITE_PATH))
 user_store = UserStore(str(USERS_PATH))
+# Rendered receipt tables and dashboard totals, invalidated on every store write
+fragment_cache = FragmentCache()
+# Only the unfiltered table views are cached; searches are too varied to reuse.
+CACHED_SORTS = ("created_at", "vendor", "date", "total")
+
+assets.init_app(app)
 
 
 @login_manager.user_loader
@@ -112,27 +122,46 @@ def get_battery_status() -> Optional[str]:
 @app.route("/")
 @login_required
 def dashboard():
-    receipts = store.list_receipts()
-    total_sum = sum(float(r.get("total", 0) or 0) for r in receipts)
-    tax_sum = sum(float(r.get("tax", 0) or 0) for r in receipts)
+    count, total_sum, tax_sum = fragment_cache.get_or_create(
+        ("dashboard",), store.data_version(), _dashboard_totals
+    )
     battery_line = get_battery_status()
     return render_template(
         "index.html",
-        count=len(receipts),
+        count=count,
         total_sum=total_sum,
         tax_sum=tax_sum,
         battery_line=battery_line,
     )
 
 
+def _dashboard_totals():
+    receipts = store.list_receipts()
+    total_sum = sum(float(r.get("total", 0) or 0) for r in receipts)
+    tax_sum = sum(float(r.get("tax", 0) or 0) for r in receipts)
+    return len(receipts), total_sum, tax_sum
+
+
 @app.route("/receipts")
 @login_required
 def receipts_table():
     search = request.args.get("search")
     sort_by = request.args.get("sort", "created_at")
     order = request.args.get("order", "desc")
-    receipts = store.list_receipts(search=search, sort_by=sort_by, descending=order != "asc")
-    return render_template("receipts.html", receipts=receipts, search=search, sort_by=sort_by, order=order)
+
+    def render_table():
+        receipts = store.list_receipts(search=search, sort_by=sort_by, descending=order != "asc")
+        return render_template("_receipts_table.html", receipts=receipts, order=order)
+
+    if not search and sort_by in CACHED_SORTS and order in ("asc", "desc"):
+        table_html = fragment_cache.get_or_create(
+            ("receipts", sort_by, order), store.data_version(), render_table
+        )
+    else:
+        table_html = render_table()
+    return render_template(
+        "receipts.html", table_html=Markup(table_html), search=search, sort_by=sort_by, order=order
+    )
 
 
 @app.route("/receipts/<receipt_id>", methods=["GET", "POST"])
@@ -189,6 +218,60 @@ def serve_image(filename):
     return send_from_directory(IMAGES_DIR, filename)
 
 
+@app.route("/api/ocr/stats")
+@login_required
+def ocr_stats_api():
+    return jsonify(ocr_stats.snapshot())
+
+
+SYNC_DEFAULT_LIMIT = 100
+SYNC_MAX_LIMIT = 500
+_image_hashes: Dict[str, Tuple[int, int, str]] = {}
+
+
+def image_sha256(path: str) -> Optional[str]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _image_hashes.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    _image_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+
+@app.route("/api/sync/changes")
+@login_required
+def sync_changes():
+    try:
+        cursor = int(request.args.get("cursor", 0))
+        limit = int(request.args.get("limit", SYNC_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify(error="cursor and limit must be integers"), 400
+    if cursor < 0 or limit < 1:
+        return jsonify(error="cursor must be >= 0 and limit >= 1"), 400
+    limit = min(limit, SYNC_MAX_LIMIT)
+
+    page = store.changes_since(cursor, limit, log_id=request.args.get("log_id"))
+    if request.args.get("include_image_hashes", "").lower() in ("1", "true", "yes"):
+        for change in page["changes"]:
+            receipt = change["receipt"]
+            if receipt and receipt.get("image_path"):
+                receipt["image_sha256"] = image_sha256(receipt["image_path"])
+
+    response = jsonify(page)
+    # Weak, so the 304 and the (possibly compressed) 200 carry the same tag.
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest(), weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
 @app.route("/export/csv")
 @login_required
 def export_csv():
@@ -198,4 +281,5 @@ def export_csv():
 if __name__ == "__main__":
     os.makedirs(DATA_DIR, exist_ok=True)
     os.makedirs(IMAGES_DIR, exist_ok=True)
+    assets.precompress_static(app.static_folder)
     app.run(host="0.0.0.0", port=5000, debug=False)
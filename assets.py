@@ -0,0 +1,165 @@
+"""Static asset fingerprinting and response compression for the web app.
+
+- ``url_for('static', ...)`` gets a ``v=<content hash>`` query argument, and
+  requests carrying the current hash are served with far-future cache headers.
+- Static text assets precompressed to ``.gz`` (and ``.br`` when the
+  optional ``brotli`` package is installed) by ``precompress_static`` are
+  served according to the client's ``Accept-Encoding``. ``app.py`` runs it
+  when started directly; other deployments can run ``python assets.py``.
+- HTML/JSON responses are compressed on the fly.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is used when brotli is not installed
+    brotli = None
+
+FAR_FUTURE_MAX_AGE = 365 * 24 * 3600
+PRECOMPRESS_EXTENSIONS = (".css", ".js", ".svg", ".html", ".json", ".txt")
+COMPRESS_MIMETYPES = ("text/html", "text/css", "text/plain", "application/json", "application/javascript")
+COMPRESS_MIN_SIZE = 500
+ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+_hash_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def file_hash(path: str) -> Optional[str]:
+    """Short content hash of ``path``, cached until the file's mtime changes."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    _hash_cache[path] = (mtime, digest)
+    return digest
+
+
+def precompress_static(static_dir: str) -> None:
+    """Write ``.gz``/``.br`` siblings for text assets that are missing or stale."""
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            stale = [
+                (encoding, suffix)
+                for encoding, suffix in ENCODING_SUFFIXES
+                if (encoding != "br" or brotli is not None) and not _is_fresh(path + suffix, path)
+            ]
+            if not stale:
+                continue
+            with open(path, "rb") as f:
+                content = f.read()
+            for encoding, suffix in stale:
+                if encoding == "br":
+                    compressed = brotli.compress(content, quality=11)
+                else:
+                    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                try:
+                    with open(path + suffix, "wb") as out:
+                        out.write(compressed)
+                except OSError as exc:
+                    # Never leave a truncated variant behind to be served as fresh;
+                    # a read-only static dir fails for every file, so stop here.
+                    try:
+                        os.remove(path + suffix)
+                    except OSError:
+                        pass
+                    print(f"[WARN] Could not write precompressed asset {path + suffix}: {exc}")
+                    return
+
+
+def _is_fresh(variant: str, source: str) -> bool:
+    return os.path.exists(variant) and os.stat(variant).st_mtime >= os.stat(source).st_mtime
+
+
+def _accepted_encodings():
+    accepted = request.accept_encodings
+    return [
+        (encoding, suffix)
+        for encoding, suffix in ENCODING_SUFFIXES
+        if accepted[encoding] and (encoding != "br" or brotli is not None)
+    ]
+
+
+def init_app(app: Flask) -> None:
+    static_dir = app.static_folder
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint != "static" or "filename" not in values or "v" in values:
+            return
+        path = safe_join(static_dir, values["filename"])
+        digest = file_hash(path) if path else None
+        if digest:
+            values["v"] = digest
+
+    def serve_static(filename):
+        path = safe_join(static_dir, filename)
+        if path and os.path.isfile(path):
+            for encoding, suffix in _accepted_encodings():
+                if _is_fresh(path + suffix, path):
+                    response = send_from_directory(static_dir, filename + suffix)
+                    response.headers["Content-Encoding"] = encoding
+                    response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                    return _cache_static(response, path)
+        return _cache_static(send_from_directory(static_dir, filename), path)
+
+    def _cache_static(response, path):
+        # Identity responses vary too: a shared cache must not hand them to a
+        # client that would have received the compressed variant, or vice versa.
+        response.vary.add("Accept-Encoding")
+        version = request.args.get("v")
+        if version and path and version == file_hash(path):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = FAR_FUTURE_MAX_AGE
+            response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = serve_static
+
+    @app.after_request
+    def compress_response(response):
+        if response.direct_passthrough or response.mimetype not in COMPRESS_MIMETYPES:
+            return response
+        # Set even when this response stays uncompressed (too small, 304, ...)
+        # because the same URL may be compressed for another client.
+        response.vary.add("Accept-Encoding")
+        if response.status_code != 200 or "Content-Encoding" in response.headers:
+            return response
+        encodings = _accepted_encodings()
+        if not encodings:
+            return response
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_SIZE:
+            return response
+
+        encoding = encodings[0][0]
+        if encoding == "br":
+            # Low quality keeps per-request CPU on the Pi in line with gzip -6.
+            compressed = brotli.compress(body, quality=4)
+        else:
+            compressed = gzip.compress(body, compresslevel=6)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+if __name__ == "__main__":
+    precompress_static(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
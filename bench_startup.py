@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Startup benchmark for the web tier.
+
+Measures, in a fresh interpreter, how long ``import app`` takes and how long
+the first request to the login page takes, plus the resident memory at that
+point. Exits non-zero if the heavy imaging/OCR stack was imported at startup
+or if a time budget is exceeded, so it can be used as a regression check:
+
+    python bench_startup.py
+    python bench_startup.py --runs 5 --max-import-ms 800 --max-first-response-ms 1500
+
+Each probe runs with ``RECEIPT_SCANNER_DATA_DIR`` pointed at a temporary
+directory. The users file, receipts CSV/DB and secret key that ``import app``
+creates go there and are deleted afterwards, not into ``data/``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+# Modules that must only be loaded when a receipt is actually processed.
+HEAVY_MODULES = ["cv2", "numpy", "pytesseract", "PIL", "easyocr", "torch"]
+
+PROBE = r"""
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+client = app.app.test_client()
+response = client.get("/login")
+responded = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_response_ms": (responded - imported) * 1000,
+    "status": response.status_code,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy_loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def run_probe() -> dict:
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, RECEIPT_SCANNER_DATA_DIR=data_dir)
+        env.setdefault("SECRET_KEY", "bench-startup")
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE % (HEAVY_MODULES,)],
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="number of fresh interpreters to sample")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if median import time exceeds this")
+    parser.add_argument(
+        "--max-first-response-ms", type=float, default=None, help="fail if median first response exceeds this"
+    )
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    import_ms = sorted(s["import_ms"] for s in samples)[len(samples) // 2]
+    first_ms = sorted(s["first_response_ms"] for s in samples)[len(samples) // 2]
+    max_rss_kb = max(s["max_rss_kb"] for s in samples)
+    heavy = sorted({name for s in samples for name in s["heavy_loaded"]})
+
+    print(f"import app:          {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"first response:      {first_ms:8.1f} ms (GET /login -> {samples[-1]['status']})")
+    print(f"max resident memory: {max_rss_kb / 1024:8.1f} MiB")
+    print(f"heavy modules:       {', '.join(heavy) if heavy else 'none'}")
+
+    failed = False
+    if heavy:
+        print("FAIL: imaging/OCR modules were imported at web-app startup")
+        failed = True
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"FAIL: import time above {args.max_import_ms} ms budget")
+        failed = True
+    if args.max_first_response_ms is not None and first_ms > args.max_first_response_ms:
+        print(f"FAIL: first response above {args.max_first_response_ms} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image
-
 
 def capture_image(output_dir: str, filename: Optional[str] = None) -> str:
     os.makedirs(output_dir, exist_ok=True)
@@ -29,6 +27,8 @@ def capture_image(output_dir: str, filename: Optional[str] = None) -> str:
     try:
         subprocess.run(command, check=True, timeout=15)
     except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as exc:
+        from PIL import Image
+
         placeholder = Image.new("RGB", (1280, 960), color=(240, 240, 240))
         placeholder.save(output_path)
         print(f"[WARN] libcamera capture failed ({exc}); saved placeholder image instead: {output_path}")
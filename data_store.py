@@ -3,7 +3,7 @@ import os
 import sqlite3
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from dateutil import parser
 
@@ -18,11 +18,14 @@ class ReceiptStore:
         "tax",
         "image_path",
         "raw_text",
+        "ocr_engine",
+        "ocr_confidence",
     ]
 
     def __init__(self, csv_path: str, sqlite_path: Optional[str] = None):
         self.csv_path = csv_path
         self.sqlite_path = sqlite_path
+        self._revision = 0
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         self._ensure_csv()
         if sqlite_path:
@@ -47,11 +50,49 @@ class ReceiptStore:
                     total REAL,
                     tax REAL,
                     image_path TEXT,
-                    raw_text TEXT
+                    raw_text TEXT,
+                    ocr_engine TEXT,
+                    ocr_confidence REAL
                 );
                 """
             )
+            # Databases created before the OCR columns existed. Their rows
+            # also stored empty totals as 0, so the mirror is rebuilt below;
+            # the sync API reads receipts from it.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(receipts)")}
+            rebuild_mirror = False
+            for column, kind in (("ocr_engine", "TEXT"), ("ocr_confidence", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE receipts ADD COLUMN {column} {kind}")
+                    rebuild_mirror = True
+            # Append-only log of receipt inserts/updates; seq is the sync cursor.
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    receipt_id TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    changed_at TEXT NOT NULL
+                );
+                """
+            )
+            # Seed the log for archives created before it existed (or whose
+            # database was deleted) so that a client starting from cursor 0
+            # still receives every receipt; the mirror is rebuilt with it.
+            if conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0] == 0:
+                rows = sorted(self._load_csv(), key=lambda r: r.get("created_at", ""))
+                conn.executemany(
+                    "INSERT INTO changes (receipt_id, op, changed_at) VALUES (?, 'insert', ?)",
+                    [(row["id"], row.get("created_at", "")) for row in rows],
+                )
+                rebuild_mirror = rebuild_mirror or bool(rows)
+            # Cursors are only meaningful within one log. A new database gets
+            # a new log id, which tells clients to resync from 0.
+            conn.execute("CREATE TABLE IF NOT EXISTS sync_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('log_id', ?)", (uuid.uuid4().hex,))
             conn.commit()
+        if rebuild_mirror:
+            self._write_sqlite(self._load_csv())
 
     def _load_csv(self) -> List[Dict[str, str]]:
         with open(self.csv_path, newline="", encoding="utf-8") as f:
@@ -59,22 +100,28 @@ class ReceiptStore:
             return list(reader)
 
     def _write_csv(self, rows: List[Dict[str, str]]) -> None:
+        self._revision += 1
         with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
             writer.writeheader()
             for row in rows:
                 writer.writerow(row)
 
-    def _write_sqlite(self, rows: List[Dict[str, str]]) -> None:
+    def _write_sqlite(self, rows: List[Dict[str, str]], change: Optional[Tuple[str, str]] = None) -> None:
         if not self.sqlite_path:
             return
         with sqlite3.connect(self.sqlite_path) as conn:
+            if change:
+                conn.execute(
+                    "INSERT INTO changes (receipt_id, op, changed_at) VALUES (?, ?, ?)",
+                    (change[0], change[1], datetime.utcnow().isoformat()),
+                )
             conn.execute("DELETE FROM receipts")
             conn.executemany(
                 """
                 INSERT OR REPLACE INTO receipts (
-                    id, created_at, date, vendor, total, tax, image_path, raw_text
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    id, created_at, date, vendor, total, tax, image_path, raw_text, ocr_engine, ocr_confidence
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 [
                     (
@@ -82,10 +129,12 @@ class ReceiptStore:
                         row["created_at"],
                         row.get("date", ""),
                         row.get("vendor", ""),
-                        float(row.get("total", 0) or 0),
-                        float(row.get("tax", 0) or 0),
+                        self._mirror_number(row.get("total")),
+                        self._mirror_number(row.get("tax")),
                         row.get("image_path", ""),
                         row.get("raw_text", ""),
+                        row.get("ocr_engine") or "",
+                        self._mirror_number(row.get("ocr_confidence")),
                     )
                     for row in rows
                 ],
@@ -124,11 +173,13 @@ class ReceiptStore:
             "tax": self._normalize_number(data.get("tax")),
             "image_path": data.get("image_path", ""),
             "raw_text": data.get("raw_text", ""),
+            "ocr_engine": data.get("ocr_engine", ""),
+            "ocr_confidence": data.get("ocr_confidence", ""),
         }
         rows = self._load_csv()
         rows.append(receipt)
         self._write_csv(rows)
-        self._write_sqlite(rows)
+        self._write_sqlite(rows, change=(receipt["id"], "insert"))
         return receipt
 
     def update_receipt(self, receipt_id: str, updates: Dict[str, str]) -> Optional[Dict[str, str]]:
@@ -150,13 +201,89 @@ class ReceiptStore:
                 break
         if updated:
             self._write_csv(rows)
-            self._write_sqlite(rows)
+            self._write_sqlite(rows, change=(receipt_id, "update"))
         return updated
 
+    def changes_since(self, cursor: int = 0, limit: int = 100, log_id: Optional[str] = None) -> Dict[str, object]:
+        """Page of change-log entries with ``seq > cursor``, oldest first.
+
+        Each entry carries the receipt's current state. Pass ``next_cursor``
+        back in to fetch the following page; ``has_more`` is false once the
+        client has caught up. Paging restarts at 0 with ``reset`` set when
+        ``log_id`` no longer matches (the database was recreated) or the
+        cursor is past the end of the log (an older backup was restored).
+        """
+        if not self.sqlite_path:
+            raise RuntimeError("The change log requires a SQLite path")
+        with sqlite3.connect(self.sqlite_path) as conn:
+            current_log_id = conn.execute("SELECT value FROM sync_meta WHERE key = 'log_id'").fetchone()[0]
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            reset = (bool(log_id) and log_id != current_log_id) or cursor > last_seq
+            if reset:
+                cursor = 0
+            entries = conn.execute(
+                "SELECT seq, receipt_id, op, changed_at FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (cursor, limit + 1),
+            ).fetchall()
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+            wanted = sorted({receipt_id for _, receipt_id, _, _ in entries})
+            receipts = self._sqlite_receipts(conn, wanted)
+        return {
+            "log_id": current_log_id,
+            "reset": reset,
+            "changes": [
+                {"seq": seq, "op": op, "changed_at": changed_at, "receipt": receipts.get(receipt_id)}
+                for seq, receipt_id, op, changed_at in entries
+            ],
+            "next_cursor": entries[-1][0] if entries else cursor,
+            "has_more": has_more,
+        }
+
+    def _sqlite_receipts(self, conn: sqlite3.Connection, ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """Receipts by id from the SQLite mirror, formatted like CSV rows."""
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" for _ in ids)
+        cursor = conn.execute(
+            f"SELECT {', '.join(self.CSV_HEADERS)} FROM receipts WHERE id IN ({placeholders})", ids
+        )
+        receipts = {}
+        for values in cursor.fetchall():
+            row = dict(zip(self.CSV_HEADERS, values))
+            for name, spec in (("total", ".2f"), ("tax", ".2f"), ("ocr_confidence", ".0f")):
+                if isinstance(row[name], float):
+                    row[name] = format(row[name], spec)
+            receipts[row["id"]] = {name: "" if value is None else value for name, value in row.items()}
+        return receipts
+
+    def data_version(self) -> str:
+        """Token that changes whenever the receipts CSV is rewritten."""
+        # The revision catches our own writes within mtime granularity;
+        # mtime and size catch edits made by other processes.
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return str(self._revision)
+        return f"{self._revision}-{stat.st_mtime_ns}-{stat.st_size}"
+
+    @staticmethod
+    def _mirror_number(value: Optional[str]):
+        # Archives can hold amounts that never normalised (e.g. "n/a" typed in
+        # the edit form); keep those as text rather than failing the write.
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
     def _normalize_number(self, value: Optional[str]) -> str:
         if value is None:
             return ""
-        text = str(value).strip().replace("$", "").replace(",", "")
+        text = str(value).strip()
+        for symbol in ("$", "€", "£", ","):
+            text = text.replace(symbol, "")
         if not text:
             return ""
         try:
@@ -0,0 +1,58 @@
+"""Small in-process cache for rendered fragments and derived page data."""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class FragmentCache:
+    """LRU cache whose entries are discarded when the data version changes.
+
+    Callers pass the store's current ``data_version()`` with every lookup, so
+    an entry rendered before a receipt was added or edited is never served.
+    The cache is bounded both by entry count and by the total length of the
+    cached strings, since a rendered receipts table can be large.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, version: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = factory()
+        size = len(value) if isinstance(value, str) else 0
+
+        with self._lock:
+            if version == self._version and size <= self.max_bytes:
+                if key in self._entries:
+                    self._total_bytes -= self._sizes[key]
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._sizes[key] = size
+                self._total_bytes += size
+                while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._total_bytes -= self._sizes.pop(evicted)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+            self._version = None
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
@@ -1,17 +1,92 @@
+import os
 import re
-from typing import Dict
-
-import cv2
-import numpy as np
-import pytesseract
-from PIL import Image
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from data_store import ReceiptStore
+from ocr_engines import EasyOCREngine, OCREngine, OCRResult, TesseractEngine
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# cv2, numpy, pytesseract and PIL are imported inside the functions that need
+# them so that importing this module (and therefore app.py) stays cheap.
+
+# Minimum confidence (0-100) for the vendor, date and total lines before a
+# result is accepted without escalating to the next cascade stage. A missing
+# vendor or total counts as zero confidence, since that is what a hard receipt
+# looks like; a missing date is ignored because many receipts do not print one.
+CONFIDENCE_THRESHOLD = 60.0
+KEY_FIELDS = ("vendor", "date", "total")
+OPTIONAL_FIELDS = ("date",)
+TOTAL_LABELS = ["total", "amount", "balance"]
+TAX_LABELS = ["tax", "vat"]
+
+# Cascade stages, cheapest first: (engine, preprocessing mode).
+CASCADE: List[Tuple[OCREngine, str]] = [
+    (TesseractEngine(), "threshold"),
+    (TesseractEngine(config="--psm 6"), "upscaled"),
+]
+# EasyOCR keeps PyTorch and its models resident in the web process, so it is
+# opt-in for devices with memory to spare.
+if os.environ.get("RECEIPT_SCANNER_EASYOCR", "false").lower() == "true":
+    CASCADE.append((EasyOCREngine(), "grayscale"))
+
+
+class OCRStats:
+    """In-memory per-engine latency and cascade escalation counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.escalations = 0
+        self.engines: Dict[str, Dict[str, float]] = {}
+
+    def record_stage(self, stage: str, result: OCRResult) -> None:
+        with self._lock:
+            entry = self.engines.setdefault(stage, {"calls": 0, "total_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += result.elapsed_ms
 
+    def record_run(self, escalated: bool) -> None:
+        with self._lock:
+            self.runs += 1
+            if escalated:
+                self.escalations += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "escalations": self.escalations,
+                "escalation_rate": self.escalations / self.runs if self.runs else 0.0,
+                "engines": {
+                    name: {
+                        "calls": entry["calls"],
+                        "avg_ms": entry["total_ms"] / entry["calls"],
+                    }
+                    for name, entry in self.engines.items()
+                },
+            }
+
+
+stats = OCRStats()
+
+
+def preprocess_image(image_path: str, mode: str = "threshold") -> "Image.Image":
+    import cv2
+    import numpy as np
+    from PIL import Image
 
-def preprocess_image(image_path: str) -> Image.Image:
     image = cv2.imread(image_path)
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if mode == "grayscale":
+        return Image.fromarray(gray)
+    if mode == "upscaled":
+        # Gentler variant for faded or unevenly lit receipts where Otsu
+        # binarisation wipes out thin strokes: upscale and keep grey levels.
+        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        return Image.fromarray(gray)
     gray = cv2.GaussianBlur(gray, (3, 3), 0)
     _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
     sharpen_kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
@@ -20,47 +95,112 @@ def preprocess_image(image_path: str) -> Image.Image:
 
 
 def run_ocr(image_path: str) -> Dict[str, str]:
-    cleaned = preprocess_image(image_path)
-    text = pytesseract.image_to_string(cleaned)
-    data = extract_fields(text)
-    data["raw_text"] = text
+    images: Dict[str, "Image.Image"] = {}
+    best: Optional[Tuple[Tuple[int, float], str, OCRResult, Dict[str, str]]] = None
+    stages_tried = 0
+
+    for engine, mode in CASCADE:
+        if not engine.available():
+            continue
+        # Stats are keyed per stage so the cheap pass and each escalation
+        # pass of the same engine are timed separately.
+        stage = f"{engine.name}/{mode}"
+        stages_tried += 1
+        if mode not in images:
+            images[mode] = preprocess_image(image_path, mode)
+        try:
+            result = engine.run(images[mode])
+        except Exception as exc:  # a broken optional engine must not lose the receipt
+            print(f"[WARN] OCR engine {engine.name} failed: {exc}")
+            continue
+        stats.record_stage(stage, result)
+
+        data = extract_fields(result.text)
+        confidences = field_confidences(result, data)
+        found = sum(1 for name in KEY_FIELDS if confidences[name] is not None)
+        scores = [
+            confidences[name] if confidences[name] is not None else 0.0
+            for name in KEY_FIELDS
+            if confidences[name] is not None or name not in OPTIONAL_FIELDS
+        ]
+        score = min(scores)
+        # Prefer the attempt that found more key fields, then the more confident one.
+        rank = (found, score)
+        if best is None or rank > best[0]:
+            best = (rank, stage, result, data)
+        if score >= CONFIDENCE_THRESHOLD:
+            break
+
+    if best is None:
+        raise RuntimeError("No OCR engine available; install tesseract-ocr and pytesseract")
+    stats.record_run(escalated=stages_tried > 1)
+
+    (_, score), stage, result, data = best
+    data["raw_text"] = result.text
     data["image_path"] = image_path
+    data["ocr_engine"] = stage
+    data["ocr_confidence"] = f"{score:.0f}"
     return data
 
 
+def field_confidences(result: OCRResult, data: Dict[str, str]) -> Dict[str, Optional[float]]:
+    """Confidence of the OCR line each field was read from, or None if it was not found."""
+    text = result.text
+    offsets = {
+        "vendor": len(text) - len(text.lstrip()) if data.get("vendor") else None,
+        "date": None,
+        "total": None,
+        "tax": None,
+    }
+    # Only count the date if it parsed; an unparseable hit is not a date.
+    date_match = _match_date(text)
+    if data.get("date") and date_match:
+        offsets["date"] = date_match.start()
+    for name, labels in (("total", TOTAL_LABELS), ("tax", TAX_LABELS)):
+        amount = _match_amount(text, labels)
+        if amount:
+            offsets[name] = amount[1]
+    return {
+        name: result.confidence_at(offset) if offset is not None else None
+        for name, offset in offsets.items()
+    }
+
+
 def extract_fields(text: str) -> Dict[str, str]:
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
     vendor = lines[0] if lines else ""
 
-    date_match = re.search(
-        r"((?:19|20)\d{2}[\-/]\d{1,2}[\-/]\d{1,2})|((?:\d{1,2}[\-/]){2}(?:19|20)\d{2})",
-        text,
-    )
-    alt_date_match = re.search(r"(\d{1,2}[A-Za-z]{3}\d{2,4})", text)
-    date_raw = ""
-    if date_match:
-        date_raw = date_match.group(0)
-    elif alt_date_match:
-        date_raw = alt_date_match.group(0)
-    date = ReceiptStore.parse_date(date_raw)
+    date_match = _match_date(text)
+    date = ReceiptStore.parse_date(date_match.group(0) if date_match else "")
 
-    total_match = _match_amount(text, labels=["total", "amount", "balance"])
-    tax_match = _match_amount(text, labels=["tax", "vat"])
+    total_match = _match_amount(text, labels=TOTAL_LABELS)
+    tax_match = _match_amount(text, labels=TAX_LABELS)
 
     return {
         "vendor": vendor,
         "date": date,
-        "total": total_match or "",
-        "tax": tax_match or "",
+        "total": total_match[0] if total_match else "",
+        "tax": tax_match[0] if tax_match else "",
     }
 
 
-def _match_amount(text: str, labels):
+def _match_date(text: str) -> Optional[re.Match]:
+    date_match = re.search(
+        r"((?:19|20)\d{2}[\-/]\d{1,2}[\-/]\d{1,2})|((?:\d{1,2}[\-/]){2}(?:19|20)\d{2})",
+        text,
+    )
+    if date_match:
+        return date_match
+    return re.search(r"(\d{1,2}[A-Za-z]{3}\d{2,4})", text)
+
+
+def _match_amount(text: str, labels) -> Optional[Tuple[str, int]]:
+    """Amount string and its offset in ``text``, preferring a labelled one."""
     pattern = r"(?:{}):?\s*([$€£]?\d+[\d,]*\.\d{{2}})".format("|".join(labels))
     match = re.search(pattern, text, flags=re.IGNORECASE)
     if match:
-        return match.group(1)
-    numbers = re.findall(r"([$€£]?\d+[\d,]*\.\d{2})", text)
+        return match.group(1), match.start(1)
+    numbers = list(re.finditer(r"([$€£]?\d+[\d,]*\.\d{2})", text))
     if numbers:
-        return numbers[-1]
+        return numbers[-1].group(1), numbers[-1].start(1)
     return None
@@ -0,0 +1,143 @@
+"""OCR engine backends used by ``ocr.run_ocr``.
+
+Each engine turns a PIL image into lines of text with a 0-100 confidence per
+line. The engine libraries are imported on first use so that importing this
+module stays cheap for the web tier.
+"""
+import importlib.util
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass
+class OCRLine:
+    text: str
+    confidence: float
+
+
+@dataclass
+class OCRResult:
+    engine: str
+    lines: List[OCRLine] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines)
+
+    def confidence_at(self, offset: int) -> float:
+        """Confidence of the line containing character ``offset`` of ``text``."""
+        index = self.text.count("\n", 0, offset)
+        return self.lines[index].confidence if index < len(self.lines) else 0.0
+
+
+class OCREngine:
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def recognize(self, image: "Image.Image") -> List[OCRLine]:
+        raise NotImplementedError
+
+    def run(self, image: "Image.Image") -> OCRResult:
+        start = time.perf_counter()
+        lines = self.recognize(image)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return OCRResult(engine=self.name, lines=lines, elapsed_ms=elapsed_ms)
+
+
+class TesseractEngine(OCREngine):
+    """Fast engine: Tesseract via ``pytesseract.image_to_data``."""
+
+    name = "tesseract"
+
+    def __init__(self, config: str = ""):
+        self.config = config
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("pytesseract") is not None
+
+    def recognize(self, image: "Image.Image") -> List[OCRLine]:
+        import pytesseract
+
+        data = pytesseract.image_to_data(image, config=self.config, output_type=pytesseract.Output.DICT)
+        grouped = {}
+        for i, word in enumerate(data["text"]):
+            word = (word or "").strip()
+            confidence = float(data["conf"][i])
+            # Tesseract reports -1 for layout boxes that carry no text.
+            if not word or confidence < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            grouped.setdefault(key, []).append((word, confidence))
+
+        lines = []
+        for words in grouped.values():
+            text = " ".join(w for w, _ in words)
+            confidence = sum(c for _, c in words) / len(words)
+            lines.append(OCRLine(text=text, confidence=confidence))
+        return lines
+
+
+class EasyOCREngine(OCREngine):
+    """Slow, more robust engine: EasyOCR (PyTorch). Only used for escalation.
+
+    The reader keeps PyTorch and the models (several hundred MB) resident in
+    the calling process, which is why ``ocr.CASCADE`` only includes this
+    engine when it is explicitly enabled.
+    """
+
+    name = "easyocr"
+
+    def __init__(self, languages: Optional[List[str]] = None):
+        self.languages = languages or ["en"]
+        self._reader = None
+        self._reader_lock = threading.Lock()
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("easyocr") is not None
+
+    def _get_reader(self):
+        # Loading the detection/recognition models takes seconds and a lot of
+        # memory; do it once, even when several requests escalate together.
+        with self._reader_lock:
+            if self._reader is None:
+                import easyocr
+
+                self._reader = easyocr.Reader(self.languages, gpu=False, verbose=False)
+        return self._reader
+
+    def recognize(self, image: "Image.Image") -> List[OCRLine]:
+        import numpy as np
+
+        detections = self._get_reader().readtext(np.array(image))
+        boxes = []
+        for bbox, text, confidence in detections:
+            ys = [point[1] for point in bbox]
+            xs = [point[0] for point in bbox]
+            boxes.append((min(ys), max(ys), min(xs), text, float(confidence) * 100))
+        boxes.sort(key=lambda b: (b[0], b[2]))
+
+        # EasyOCR returns word/phrase boxes; merge those whose vertical centre
+        # falls inside the current row so receipts read line by line.
+        rows = []
+        for top, bottom, left, text, confidence in boxes:
+            centre = (top + bottom) / 2
+            if rows and rows[-1]["top"] <= centre <= rows[-1]["bottom"]:
+                rows[-1]["items"].append((left, text, confidence))
+            else:
+                rows.append({"top": top, "bottom": bottom, "items": [(left, text, confidence)]})
+
+        lines = []
+        for row in rows:
+            items = sorted(row["items"])
+            text = " ".join(t for _, t, _ in items)
+            confidence = sum(c for _, _, c in items) / len(items)
+            lines.append(OCRLine(text=text, confidence=confidence))
+        return lines
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Simple test script to verify static fingerprinting and compression."""
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from flask import Flask, url_for
+
+import assets
+
+CSS = "body { color: black; }\n" * 100
+
+def make_app(static_dir):
+    app = Flask(__name__, static_folder=static_dir)
+
+    @app.route("/page")
+    def page():
+        return "<p>receipt</p>" * 200
+
+    @app.route("/small")
+    def small():
+        return "<p>ok</p>"
+
+    assets.init_app(app)
+    return app
+
+def test_assets():
+    """Test fingerprint URLs, cache headers and content negotiation."""
+    print("Testing static assets...")
+
+    with tempfile.TemporaryDirectory() as static_dir:
+        os.makedirs(os.path.join(static_dir, "css"))
+        css_path = os.path.join(static_dir, "css", "site.css")
+        Path(css_path).write_text(CSS)
+        app = make_app(static_dir)
+        client = app.test_client()
+
+        # Test 1: Static URLs carry the content hash
+        print("\n✓ Test 1: Static URLs carry the content hash")
+        with app.test_request_context():
+            url = url_for("static", filename="css/site.css")
+        digest = assets.file_hash(css_path)
+        assert url.endswith(f"?v={digest}"), "Static URL should include the content hash"
+
+        # Test 2: Fingerprinted requests are cached for a year
+        print("✓ Test 2: Fingerprinted requests are cached for a year")
+        response = client.get(url)
+        assert response.cache_control.max_age == assets.FAR_FUTURE_MAX_AGE, "Far-future max-age"
+        assert response.cache_control.immutable, "Fingerprinted asset should be immutable"
+        assert "Accept-Encoding" in response.vary, "Identity response must still vary"
+        stale = client.get("/static/css/site.css?v=outdated")
+        assert stale.cache_control.max_age != assets.FAR_FUTURE_MAX_AGE, "Stale hash is not immutable"
+        response.close()
+        stale.close()
+
+        # Test 3: Precompressed variants follow Accept-Encoding
+        print("✓ Test 3: Precompressed variants follow Accept-Encoding")
+        assets.precompress_static(static_dir)
+        assert os.path.exists(css_path + ".gz"), "Gzip variant should be written"
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("Content-Encoding") == "gzip", "Gzip variant should be served"
+        assert response.mimetype == "text/css", "Variant keeps the original content type"
+        assert gzip.decompress(response.get_data()).decode() == CSS, "Variant decompresses to the asset"
+        response.close()
+        response = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers, "Identity client gets the plain file"
+        response.close()
+        if assets.brotli is not None:
+            response = client.get(url, headers={"Accept-Encoding": "br, gzip"})
+            assert response.headers.get("Content-Encoding") == "br", "Brotli is preferred when available"
+            response.close()
+
+        # Test 4: Stale variants are ignored
+        print("✓ Test 4: Stale variants are ignored")
+        os.utime(css_path + ".gz", (0, 0))
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers, "Outdated .gz must not be served"
+        response.close()
+
+        # Test 5: HTML responses are compressed on the fly
+        print("✓ Test 5: HTML responses are compressed on the fly")
+        response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("Content-Encoding") == "gzip", "Large HTML should be compressed"
+        assert gzip.decompress(response.get_data()).decode() == "<p>receipt</p>" * 200, "Body round-trips"
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in small.headers, "Small responses stay uncompressed"
+        assert "Accept-Encoding" in small.vary, "Uncompressed HTML must still vary"
+
+        print("\n✅ All tests passed!")
+
+if __name__ == "__main__":
+    test_assets()
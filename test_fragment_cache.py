@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Simple test script to verify fragment cache invalidation and bounds."""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from data_store import ReceiptStore
+from fragment_cache import FragmentCache
+
+def test_fragment_cache():
+    """Test that cached fragments never outlive a data change."""
+    print("Testing fragment cache...")
+
+    # Test 1: Same version reuses the cached value
+    print("\n✓ Test 1: Same version reuses the cached value")
+    cache = FragmentCache()
+    calls = []
+    render = lambda: calls.append(1) or f"table {len(calls)}"
+    assert cache.get_or_create("receipts", "v1", render) == "table 1", "First lookup renders"
+    assert cache.get_or_create("receipts", "v1", render) == "table 1", "Second lookup is cached"
+    assert len(calls) == 1, "Factory should run once per version"
+
+    # Test 2: A new version discards every entry
+    print("✓ Test 2: A new version discards every entry")
+    assert cache.get_or_create("receipts", "v2", render) == "table 2", "New version re-renders"
+    assert cache.get_or_create("receipts", "v1", render) == "table 3", "Old version is not resurrected"
+
+    # Test 3: Store writes change the data version
+    print("✓ Test 3: Store writes change the data version")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReceiptStore(csv_path=os.path.join(tmp, "receipts.csv"))
+        cache = FragmentCache()
+        vendors = lambda: ",".join(r["vendor"] for r in store.list_receipts())
+        receipt = store.add_receipt({"vendor": "Cafe"})
+        assert cache.get_or_create("vendors", store.data_version(), vendors) == "Cafe", "Initial render"
+        store.update_receipt(receipt["id"], {"vendor": "Bakery"})
+        assert cache.get_or_create("vendors", store.data_version(), vendors) == "Bakery", (
+            "An edit must not serve the stale fragment"
+        )
+
+    # Test 4: Entry and byte bounds evict least recently used entries
+    print("✓ Test 4: Entry and byte bounds evict least recently used entries")
+    cache = FragmentCache(max_entries=2, max_bytes=10)
+    cache.get_or_create("a", "v", lambda: "aaaa")
+    cache.get_or_create("b", "v", lambda: "bbbb")
+    cache.get_or_create("a", "v", lambda: "new a")
+    cache.get_or_create("c", "v", lambda: "cccc")
+    assert cache.get_or_create("a", "v", lambda: "new a") == "aaaa", "Recently used entry survives"
+    assert cache.get_or_create("b", "v", lambda: "new b") == "new b", "Least recently used entry is evicted"
+    assert cache.get_or_create("big", "v", lambda: "x" * 50) == "x" * 50, "Oversized values are returned"
+    assert cache.get_or_create("big", "v", lambda: "rendered again") == "rendered again", (
+        "Oversized values are not cached"
+    )
+
+    print("\n✅ All tests passed!")
+
+if __name__ == "__main__":
+    test_fragment_cache()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Simple test script to verify the OCR engine cascade without Tesseract."""
+import sys
+import types
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import ocr
+from ocr_engines import OCREngine, OCRLine, TesseractEngine
+
+class FakeEngine(OCREngine):
+    """Engine returning fixed lines at a fixed confidence."""
+
+    def __init__(self, name, lines, confidence=95.0, fail=False):
+        self.name = name
+        self.lines = lines
+        self.confidence = confidence
+        self.fail = fail
+        self.calls = 0
+
+    def recognize(self, image):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("engine crashed")
+        return [OCRLine(text=line, confidence=self.confidence) for line in self.lines]
+
+RECEIPT = ["ACME MARKET", "2024-03-05", "Milk 2.49", "TOTAL 12.50"]
+
+def run_cascade(*engines):
+    ocr.CASCADE = [(engine, "threshold") for engine in engines]
+    return ocr.run_ocr("receipt.jpg")
+
+def test_ocr_cascade():
+    """Test cascade escalation rules, stats and Tesseract line grouping."""
+    print("Testing OCR cascade...")
+
+    original_cascade = ocr.CASCADE
+    original_preprocess = ocr.preprocess_image
+    original_stats = ocr.stats
+    ocr.preprocess_image = lambda image_path, mode="threshold": None
+    ocr.stats = ocr.OCRStats()
+
+    try:
+        # Test 1: Confident first stage stops the cascade
+        print("\n✓ Test 1: Confident first stage stops the cascade")
+        fast = FakeEngine("fast", RECEIPT, confidence=95)
+        slow = FakeEngine("slow", RECEIPT, confidence=99)
+        data = run_cascade(fast, slow)
+        assert slow.calls == 0, "Slow engine should not run"
+        assert data["ocr_engine"] == "fast/threshold" and data["ocr_confidence"] == "95", "Fast result should be kept"
+        assert data["total"] == "12.50" and data["date"] == "2024-03-05", "Fields should be extracted"
+
+        # Test 2: A missing date does not force escalation, a missing total does
+        print("✓ Test 2: A missing date does not force escalation, a missing total does")
+        fast = FakeEngine("fast", ["ACME MARKET", "TOTAL 12.50"], confidence=95)
+        slow = FakeEngine("slow", RECEIPT, confidence=99)
+        data = run_cascade(fast, slow)
+        assert slow.calls == 0, "A receipt without a date should take the cheap path"
+        assert data["ocr_confidence"] == "95", "Confidence should ignore the missing date"
+        fast = FakeEngine("fast", ["ACME MARKET", "2024-03-05"], confidence=95)
+        slow = FakeEngine("slow", RECEIPT, confidence=99)
+        data = run_cascade(fast, slow)
+        assert slow.calls == 1, "A receipt without a total should escalate"
+        assert data["ocr_engine"] == "slow/threshold", "The attempt that found the total should win"
+
+        # Test 3: Low confidence escalates and the best attempt wins
+        print("✓ Test 3: Low confidence escalates and the best attempt wins")
+        fast = FakeEngine("fast", RECEIPT, confidence=40)
+        middle = FakeEngine("middle", RECEIPT, confidence=50)
+        slow = FakeEngine("slow", RECEIPT, confidence=45)
+        data = run_cascade(fast, middle, slow)
+        assert (fast.calls, middle.calls, slow.calls) == (1, 1, 1), "All stages should run"
+        assert data["ocr_engine"] == "middle/threshold", "Most confident attempt should win"
+
+        # Test 4: Finding more key fields beats a higher confidence
+        print("✓ Test 4: Finding more key fields beats a higher confidence")
+        fast = FakeEngine("fast", ["ACME MARKET"], confidence=50)
+        slow = FakeEngine("slow", RECEIPT, confidence=45)
+        data = run_cascade(fast, slow)
+        assert data["ocr_engine"] == "slow/threshold", "Attempt with vendor, date and total should win"
+
+        # Test 5: A failing engine is skipped
+        print("✓ Test 5: A failing engine is skipped")
+        broken = FakeEngine("broken", RECEIPT, fail=True)
+        fallback = FakeEngine("fallback", RECEIPT, confidence=90)
+        data = run_cascade(broken, fallback)
+        assert data["ocr_engine"] == "fallback/threshold", "Cascade should continue past a failing engine"
+
+        # Test 6: Total confidence comes from the line the amount was read from
+        print("✓ Test 6: Field confidence uses the matching line")
+        result = FakeEngine("x", []).run(None)
+        result.lines = [
+            OCRLine("ACME MARKET", 90),
+            OCRLine("12.50 Bread", 20),
+            OCRLine("Due 12.50", 80),
+            OCRLine("2024-13-45", 10),
+        ]
+        confidences = ocr.field_confidences(result, ocr.extract_fields(result.text))
+        assert confidences["total"] == 80, "Unlabelled total is the last amount, not the first line containing it"
+        assert confidences["date"] is None, "An unparseable date counts as missing"
+
+        # Test 7: Stats record latency and escalation rate
+        print("✓ Test 7: Stats record latency and escalation rate")
+        snapshot = ocr.stats.snapshot()
+        assert snapshot["runs"] == 6, "Every run_ocr call should be counted"
+        assert snapshot["escalations"] == 4, "The missing total, tests 3 and 4 and the failed stage escalated"
+        assert abs(snapshot["escalation_rate"] - 4 / 6) < 1e-9, "Escalation rate should be escalations/runs"
+        assert snapshot["engines"]["fast/threshold"]["calls"] == 5, "Per-stage calls should be counted"
+        assert "broken/threshold" not in snapshot["engines"], "Failed stages should not be timed"
+
+        # Test 8: Tesseract words are grouped into lines
+        print("✓ Test 8: Tesseract words are grouped into lines")
+        fake_tesseract = types.ModuleType("pytesseract")
+        fake_tesseract.Output = types.SimpleNamespace(DICT="dict")
+        fake_tesseract.image_to_data = lambda image, config="", output_type=None: {
+            "text": ["", "ACME", "MARKET", "TOTAL", "12.50"],
+            "conf": ["-1", "90", "80", "70", "50"],
+            "block_num": [0, 1, 1, 1, 1],
+            "par_num": [0, 1, 1, 1, 1],
+            "line_num": [0, 1, 1, 2, 2],
+        }
+        real_tesseract = sys.modules.get("pytesseract")
+        sys.modules["pytesseract"] = fake_tesseract
+        try:
+            lines = TesseractEngine().recognize(None)
+        finally:
+            if real_tesseract is None:
+                del sys.modules["pytesseract"]
+            else:
+                sys.modules["pytesseract"] = real_tesseract
+        assert [line.text for line in lines] == ["ACME MARKET", "TOTAL 12.50"], "Words should join per line"
+        assert [line.confidence for line in lines] == [85, 60], "Line confidence is the mean word confidence"
+
+        print("\n✅ All tests passed!")
+
+    finally:
+        ocr.CASCADE = original_cascade
+        ocr.preprocess_image = original_preprocess
+        ocr.stats = original_stats
+
+if __name__ == "__main__":
+    test_ocr_cascade()
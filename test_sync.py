@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Simple test script to verify the receipt change log used by the sync API."""
+import csv
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from data_store import ReceiptStore
+
+def test_change_log():
+    """Test change log recording and cursor paging."""
+    print("Testing receipt change log...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "receipts.csv")
+        sqlite_path = os.path.join(tmp, "receipts.db")
+
+        # Test 1: Empty store has no changes
+        print("\n✓ Test 1: Empty store has no changes")
+        store = ReceiptStore(csv_path=csv_path, sqlite_path=sqlite_path)
+        page = store.changes_since(0)
+        assert page["changes"] == [], "New store should have an empty change log"
+        assert page["next_cursor"] == 0, "Cursor should not move without changes"
+        assert not page["has_more"], "Nothing more to fetch"
+
+        # Test 2: Inserts and updates are logged in order
+        print("✓ Test 2: Inserts and updates are logged in order")
+        first = store.add_receipt({"vendor": "Cafe", "total": "4.50"})
+        second = store.add_receipt({"vendor": "Market", "total": "12.00"})
+        store.update_receipt(first["id"], {"vendor": "Corner Cafe"})
+        page = store.changes_since(0)
+        ops = [(c["op"], c["receipt"]["id"]) for c in page["changes"]]
+        assert ops == [
+            ("insert", first["id"]),
+            ("insert", second["id"]),
+            ("update", first["id"]),
+        ], "Change log should record every insert and update"
+        assert page["changes"][0]["receipt"]["vendor"] == "Corner Cafe", "Entries carry current state"
+        assert page["changes"][0]["receipt"]["total"] == "4.50", "Amounts keep their CSV format"
+        assert page["changes"][0]["receipt"]["tax"] == "", "Missing amounts stay empty, not 0.00"
+
+        # Test 3: Paging with a cursor
+        print("✓ Test 3: Paging with a cursor")
+        page1 = store.changes_since(0, limit=2)
+        assert len(page1["changes"]) == 2 and page1["has_more"], "First page should be full"
+        page2 = store.changes_since(page1["next_cursor"], limit=2)
+        assert len(page2["changes"]) == 1 and not page2["has_more"], "Second page has the rest"
+        caught_up = store.changes_since(page2["next_cursor"])
+        assert caught_up["changes"] == [], "No changes after the last cursor"
+        assert caught_up["next_cursor"] == page2["next_cursor"], "Cursor stays put when caught up"
+
+        # Test 4: Existing archives are seeded into a new change log
+        print("✓ Test 4: Existing archives are seeded into a new change log")
+        old_log_id = store.changes_since(0)["log_id"]
+        old_cursor = store.changes_since(0)["next_cursor"]
+        os.unlink(sqlite_path)
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            existing = list(csv.DictReader(f))
+        reopened = ReceiptStore(csv_path=csv_path, sqlite_path=sqlite_path)
+        page = reopened.changes_since(0)
+        assert len(page["changes"]) == len(existing), "Every existing receipt should be logged once"
+        assert all(c["op"] == "insert" for c in page["changes"]), "Seeded entries are inserts"
+        assert all(c["receipt"] for c in page["changes"]), "Seeded entries carry the receipt"
+
+        # Test 5: A recreated log is detected by its log id
+        print("✓ Test 5: A recreated log is detected by its log id")
+        assert page["log_id"] != old_log_id, "A new database should get a new log id"
+        stale = reopened.changes_since(old_cursor, log_id=old_log_id)
+        assert stale["reset"], "A cursor from the old log should trigger a reset"
+        assert len(stale["changes"]) == len(existing), "A reset restarts paging from 0"
+        current = reopened.changes_since(0, log_id=page["log_id"])
+        assert not current["reset"], "The current log id should not reset"
+        ahead = reopened.changes_since(current["next_cursor"] + 10, log_id=page["log_id"])
+        assert ahead["reset"], "A cursor past the end of the log (restored backup) should reset"
+
+        # Test 6: Archives with amounts that never normalised still open
+        print("✓ Test 6: Archives with unparseable amounts still open")
+        legacy_csv = os.path.join(tmp, "legacy.csv")
+        legacy_db = os.path.join(tmp, "legacy.db")
+        with open(legacy_csv, "w", newline="", encoding="utf-8") as f:
+            # Baseline schema (no OCR columns), as written before the mirror could fail
+            headers = ["id", "created_at", "date", "vendor", "total", "tax", "image_path", "raw_text"]
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            writer.writerow({"id": "euro", "created_at": "2024-01-01T00:00:00", "vendor": "Paris", "total": "€12.50"})
+            writer.writerow({"id": "typed", "created_at": "2024-01-02T00:00:00", "vendor": "Shop", "total": "n/a"})
+        legacy = ReceiptStore(csv_path=legacy_csv, sqlite_path=legacy_db)
+        page = legacy.changes_since(0)
+        totals = {c["receipt"]["id"]: c["receipt"]["total"] for c in page["changes"]}
+        assert totals == {"euro": "€12.50", "typed": "n/a"}, "Unparseable amounts are mirrored as text"
+        added = legacy.add_receipt({"vendor": "London", "total": "£3.00"})
+        assert added["total"] == "3.00", "Pound and euro signs are stripped when normalising"
+        page = legacy.changes_since(page["next_cursor"])
+        assert [c["receipt"]["id"] for c in page["changes"]] == [added["id"]], "Later writes are still logged"
+
+        print("\n✅ All tests passed!")
+
+if __name__ == "__main__":
+    test_change_log()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Simple test script to verify the /api/sync/changes endpoint."""
+import hashlib
+import importlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+def test_sync_api():
+    """Test paging, validation, image hashes and conditional requests."""
+    print("Testing sync API...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {
+            "RECEIPT_SCANNER_DATA_DIR": data_dir,
+            "RECEIPT_SCANNER_USERNAME": "syncuser",
+            "RECEIPT_SCANNER_PASSWORD": "syncpass123",
+            "SECRET_KEY": "test-sync-api",
+        }
+        saved = {name: os.environ.get(name) for name in env}
+        os.environ.update(env)
+
+        try:
+            # app.py reads the data directory at import time; reload it if an
+            # earlier test already imported it so the temp directory is used.
+            if "app" in sys.modules:
+                app_module = importlib.reload(sys.modules["app"])
+            else:
+                app_module = importlib.import_module("app")
+            assert app_module.DATA_DIR == Path(data_dir), "app should use the temporary data directory"
+            client = app_module.app.test_client()
+            client.post("/login", data={"username": "syncuser", "password": "syncpass123"})
+
+            image_path = os.path.join(data_dir, "receipt.jpg")
+            Path(image_path).write_bytes(b"fake image bytes")
+            for vendor in ("Cafe", "Market", "Bakery"):
+                app_module.store.add_receipt(
+                    {"vendor": vendor, "total": "1.00", "image_path": image_path, "raw_text": vendor * 50}
+                )
+
+            # Test 1: Paging through the change log
+            print("\n✓ Test 1: Paging through the change log")
+            first = client.get("/api/sync/changes?cursor=0&limit=2")
+            assert first.status_code == 200, "Sync should succeed"
+            body = first.get_json()
+            assert len(body["changes"]) == 2 and body["has_more"], "First page holds two changes"
+            second = client.get(f"/api/sync/changes?cursor={body['next_cursor']}&limit=2").get_json()
+            assert [c["receipt"]["vendor"] for c in second["changes"]] == ["Bakery"], "Second page has the rest"
+            assert not second["has_more"], "Client has caught up"
+
+            # Test 2: Invalid cursor or limit is rejected
+            print("✓ Test 2: Invalid cursor or limit is rejected")
+            for query in ("cursor=abc", "limit=x", "cursor=-1", "limit=0"):
+                assert client.get(f"/api/sync/changes?{query}").status_code == 400, f"{query} should be a 400"
+
+            # Test 3: Limit is clamped to the maximum page size
+            print("✓ Test 3: Limit is clamped to the maximum page size")
+            original_max = app_module.SYNC_MAX_LIMIT
+            app_module.SYNC_MAX_LIMIT = 1
+            try:
+                clamped = client.get("/api/sync/changes?limit=1000").get_json()
+            finally:
+                app_module.SYNC_MAX_LIMIT = original_max
+            assert len(clamped["changes"]) == 1 and clamped["has_more"], "Limit should be clamped"
+
+            # Test 4: Image hashes are only included on request
+            print("✓ Test 4: Image hashes are only included on request")
+            plain = client.get("/api/sync/changes").get_json()
+            assert "image_sha256" not in plain["changes"][0]["receipt"], "Hashes are opt-in"
+            hashed = client.get("/api/sync/changes?include_image_hashes=1").get_json()
+            expected = hashlib.sha256(b"fake image bytes").hexdigest()
+            assert hashed["changes"][0]["receipt"]["image_sha256"] == expected, "Hash should match the image"
+
+            # Test 5: If-None-Match returns 304 with the same weak ETag
+            print("✓ Test 5: If-None-Match returns 304 with the same weak ETag")
+            for headers in ({}, {"Accept-Encoding": "gzip"}):
+                full = client.get("/api/sync/changes", headers=headers)
+                etag = full.headers["ETag"]
+                assert etag.startswith('W/"'), "ETag should be weak"
+                cached = client.get("/api/sync/changes", headers={**headers, "If-None-Match": etag})
+                assert cached.status_code == 304, "Unchanged page should be a 304"
+                assert cached.headers["ETag"] == etag, "304 and 200 should carry the same ETag"
+            app_module.store.add_receipt({"vendor": "Deli"})
+            changed = client.get("/api/sync/changes", headers={"If-None-Match": etag})
+            assert changed.status_code == 200, "A new change should invalidate the ETag"
+
+            # Test 6: A stale log id restarts from cursor 0
+            print("✓ Test 6: A stale log id restarts from cursor 0")
+            reset = client.get(f"/api/sync/changes?cursor={second['next_cursor']}&log_id=old").get_json()
+            assert reset["reset"] and len(reset["changes"]) == 4, "Stale log id should resync everything"
+
+            print("\n✅ All tests passed!")
+
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+if __name__ == "__main__":
+    test_sync_api()